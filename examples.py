@@ -13,9 +13,73 @@ Output Passing Mechanisms:
 """
 
 import asyncio
+import dataclasses
+import functools
+import io
+import os
+import re
+import sys
 from pathlib import Path
+from typing import List, Optional
 from claude_agent_sdk import query, ClaudeAgentOptions
-from flexible_orchestrator import AgentRegistry, AgentConfig, FlexibleOrchestrator
+from flexible_orchestrator import AgentRegistry, AgentConfig, FlexibleOrchestrator, MessagePrinter
+from serialization import load_json
+
+try:
+    import ijson
+except ImportError:  # optional, counts fall back to a full load_json()
+    ijson = None
+
+
+def _list_outputs_by_mtime(workspace: Path) -> List[os.DirEntry]:
+    """
+    List output files (names containing a dot) sorted by modification time.
+    os.DirEntry caches its stat() result, so later size lookups are free.
+    """
+    with os.scandir(workspace) as it:
+        entries = [e for e in it if e.is_file() and '.' in e.name]
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    return entries
+
+
+def _read_head(file_path: Path, size: int = 256) -> str:
+    """Read and decode only the first bytes of a file for previews"""
+    with open(file_path, 'rb') as f:
+        return f.read(size).decode('utf-8', errors='replace')
+
+
+def _count_json_items(file_path: Path, key: str) -> int:
+    """Count the items of a top-level JSON array without loading the whole file"""
+    if ijson is None:
+        return len(load_json(file_path).get(key, []))
+    with open(file_path, 'rb') as f:
+        return sum(1 for _ in ijson.items(f, f"{key}.item"))
+
+
+# Agent keywords in priority order, matched with one case-insensitive scan
+_CLASSIFIER_LABELS = (
+    (b"research", "researcher"),
+    (b"analysis", "analyzer"),
+    (b"summary", "summarizer"),
+)
+_CLASSIFIER_RE = re.compile(
+    b"|".join(re.escape(keyword) for keyword, _ in _CLASSIFIER_LABELS), re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=512)
+def _classify_file(path_str: str, mtime_ns: int, size: int) -> Optional[str]:
+    """
+    Guess which agent produced a file from the start of its content.
+    mtime_ns and size are part of the cache key, so edited files are re-read.
+    """
+    with open(path_str, 'rb') as f:
+        head = f.read(200)
+    found = {match.lower() for match in _CLASSIFIER_RE.findall(head)}
+    for keyword, label in _CLASSIFIER_LABELS:
+        if keyword in found:
+            return label
+    return None
 
 
 # ============================================================================
@@ -114,6 +178,36 @@ async def example_file_based_passing():
 # PATTERN 2: Explicit Task Tool with Context Injection
 # ============================================================================
 
+_AGENT_A_TASK = """
+    Search for the top 3 programming languages in 2025.
+    Save your findings to: languages.json
+    
+    Format:
+    {
+        "languages": [
+            {"name": "Python", "rank": 1, "usage": "..."},
+            ...
+        ]
+    }
+    """
+
+# Agent B's prompt wraps Agent A's output between a static prefix and suffix
+_AGENT_B_TASK_PREFIX = """
+        You are receiving output from the previous agent.
+        
+        PREVIOUS AGENT OUTPUT (from languages.json):
+        """
+
+_AGENT_B_TASK_SUFFIX = """
+        
+        YOUR TASK:
+        1. Analyze this data
+        2. Compare the languages
+        3. Create a comparison report
+        4. Save to: comparison_report.md
+        """
+
+
 async def example_explicit_context_injection():
     """
     Show how the orchestrator explicitly passes context between agents
@@ -136,18 +230,7 @@ async def example_explicit_context_injection():
         system_prompt="You gather data and save to files."
     )
     
-    agent_a_task = """
-    Search for the top 3 programming languages in 2025.
-    Save your findings to: languages.json
-    
-    Format:
-    {
-        "languages": [
-            {"name": "Python", "rank": 1, "usage": "..."},
-            ...
-        ]
-    }
-    """
+    agent_a_task = _AGENT_A_TASK
     
     async for msg in query(prompt=agent_a_task, options=agent_a_options):
         pass
@@ -169,18 +252,7 @@ async def example_explicit_context_injection():
         )
         
         # Inject Agent A's output into Agent B's prompt
-        agent_b_task = f"""
-        You are receiving output from the previous agent.
-        
-        PREVIOUS AGENT OUTPUT (from languages.json):
-        {languages_data}
-        
-        YOUR TASK:
-        1. Analyze this data
-        2. Compare the languages
-        3. Create a comparison report
-        4. Save to: comparison_report.md
-        """
+        agent_b_task = _AGENT_B_TASK_PREFIX + languages_data + _AGENT_B_TASK_SUFFIX
         
         async for msg in query(prompt=agent_b_task, options=agent_b_options):
             pass
@@ -201,6 +273,13 @@ class StatefulOrchestrator(FlexibleOrchestrator):
     def __init__(self, agent_registry, workspace_dir="./workspace"):
         super().__init__(agent_registry, workspace_dir)
         self.agent_outputs = {}  # Track outputs from each agent
+        # Shared by every run; per-call changes go through dataclasses.replace
+        self._options_template = ClaudeAgentOptions(
+            cwd=str(self.workspace),
+            allowed_tools=["Read", "Write", "Task", "WebSearch"],
+            permission_mode="plan",
+            system_prompt="You coordinate agents with explicit output passing."
+        )
     
     def _create_orchestrator_prompt_with_passing(self, task: str) -> str:
         """
@@ -248,36 +327,41 @@ Agent A → output_a.ext → Agent B → output_b.ext → Agent C → final_outp
 Show your decomposition plan with explicit input/output files for each step.
 """
     
-    async def execute_with_tracking(self, task: str):
+    async def execute_with_tracking(self, task: str, permission_mode: str = "plan"):
         """Execute and track all outputs"""
         prompt = self._create_orchestrator_prompt_with_passing(task)
         
-        options = ClaudeAgentOptions(
-            cwd=str(self.workspace),
-            allowed_tools=["Read", "Write", "Task", "WebSearch"],
-            permission_mode="plan",
-            system_prompt="You coordinate agents with explicit output passing."
-        )
+        options = self._options_template
+        if permission_mode != options.permission_mode:
+            options = dataclasses.replace(options, permission_mode=permission_mode)
         
         print("\nExecuting with output tracking...\n")
         
-        async for message in query(prompt=prompt, options=options):
-            print(message)
+        with MessagePrinter() as printer:
+            async for message in query(prompt=prompt, options=options):
+                printer.print(message)
         
         # Track all created files
-        print("\n" + "="*70)
-        print("OUTPUT PASSING CHAIN:")
-        print("="*70)
+        buf = io.StringIO()
+        buf.write("\n" + "="*70 + "\n")
+        buf.write("OUTPUT PASSING CHAIN:\n")
+        buf.write("="*70 + "\n")
         
-        files = sorted(self.workspace.glob("*.*"), key=lambda x: x.stat().st_mtime)
+        files = await asyncio.to_thread(_list_outputs_by_mtime, self.workspace)
+        # Read all previews concurrently instead of one file at a time
+        previews = await asyncio.gather(
+            *(asyncio.to_thread(_read_head, entry.path) for entry in files)
+        )
         
-        for i, file_path in enumerate(files, 1):
-            print(f"\nStep {i}: {file_path.name}")
-            print(f"  Size: {file_path.stat().st_size} bytes")
+        for i, (entry, preview) in enumerate(zip(files, previews), 1):
+            buf.write(f"\nStep {i}: {entry.name}\n")
+            buf.write(f"  Size: {entry.stat().st_size} bytes\n")
             
             # Show first 100 chars to verify content
-            content = file_path.read_text()[:100]
-            print(f"  Preview: {content}...")
+            buf.write(f"  Preview: {preview[:100]}...\n")
+        
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
 
 async def example_stateful_orchestration():
@@ -487,17 +571,13 @@ async def example_structured_data_passing():
     print("STRUCTURED DATA CHAIN:")
     print("="*70)
     
-    import json
-    
     if (workspace / "companies.json").exists():
         print("\n✓ Step 1: companies.json (raw data)")
-        data = json.loads((workspace / "companies.json").read_text())
-        print(f"  Records: {len(data.get('companies', []))}")
+        print(f"  Records: {_count_json_items(workspace / 'companies.json', 'companies')}")
     
     if (workspace / "companies_enriched.json").exists():
         print("\n✓ Step 2: companies_enriched.json (transformed)")
-        data = json.loads((workspace / "companies_enriched.json").read_text())
-        print(f"  Records: {len(data.get('companies', []))}")
+        print(f"  Records: {_count_json_items(workspace / 'companies_enriched.json', 'companies')}")
         print(f"  New fields added by transformer")
     
     if (workspace / "companies_report.md").exists():
@@ -513,32 +593,33 @@ def visualize_output_chain(workspace: Path):
     """
     Visualize the output passing chain by analyzing file timestamps
     """
-    files = sorted(workspace.glob("*.*"), key=lambda x: x.stat().st_mtime)
+    files = _list_outputs_by_mtime(workspace)
     
     if not files:
         print("No output files found")
         return
     
-    print("\n" + "="*70)
-    print("OUTPUT PASSING VISUALIZATION")
-    print("="*70 + "\n")
+    buf = io.StringIO()
+    buf.write("\n" + "="*70 + "\n")
+    buf.write("OUTPUT PASSING VISUALIZATION\n")
+    buf.write("="*70 + "\n\n")
     
-    for i, file_path in enumerate(files):
+    for i, entry in enumerate(files):
         prefix = "└→" if i == len(files) - 1 else "├→"
-        print(f"{prefix} {file_path.name}")
-        print(f"   Size: {file_path.stat().st_size} bytes")
+        buf.write(f"{prefix} {entry.name}\n")
+        buf.write(f"   Size: {entry.stat().st_size} bytes\n")
         
         # Try to detect what agent created it (from content)
-        content = file_path.read_text()[:200]
-        if "research" in content.lower():
-            print(f"   Likely from: researcher agent")
-        elif "analysis" in content.lower():
-            print(f"   Likely from: analyzer agent")
-        elif "summary" in content.lower():
-            print(f"   Likely from: summarizer agent")
+        stat = entry.stat()
+        agent = _classify_file(entry.path, stat.st_mtime_ns, stat.st_size)
+        if agent:
+            buf.write(f"   Likely from: {agent} agent\n")
         
         if i < len(files) - 1:
-            print(f"   ↓")
+            buf.write("   ↓\n")
+    
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 
 # ============================================================================
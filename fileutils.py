@@ -0,0 +1,18 @@
+"""
+Filesystem Helpers
+==================
+
+Small filesystem utilities shared by the orchestrators.
+"""
+
+from pathlib import Path
+from typing import Union
+
+
+def ensure_dir(path: Union[str, Path]) -> Path:
+    """Create the directory if it is missing and return it as a Path"""
+    path = Path(path)
+    # Always ask the filesystem: the directory may have been deleted since the
+    # last call, or a relative path may now point elsewhere after os.chdir()
+    path.mkdir(exist_ok=True)
+    return path
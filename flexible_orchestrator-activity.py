@@ -11,19 +11,26 @@ Features:
 """
 
 import asyncio
-import json
+import functools
+import os
+import time
+from collections import Counter, defaultdict, deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
-from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Callable
+from dataclasses import dataclass, field, replace
 from claude_agent_sdk import query, ClaudeAgentOptions, Hooks
+from flexible_orchestrator import MessagePrinter
+
+import serialization
+from fileutils import ensure_dir
 
 
 # ============================================================================
 # Agent Registry - Plugin System
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """Configuration for a pluggable agent"""
     name: str
@@ -32,6 +39,15 @@ class AgentConfig:
     system_prompt: str
     capabilities: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    def copy(self) -> "AgentConfig":
+        """Return a copy whose tools, capabilities and metadata are not shared"""
+        return replace(
+            self,
+            tools=list(self.tools),
+            capabilities=list(self.capabilities),
+            metadata=dict(self.metadata)
+        )
 
 
 class AgentRegistry:
@@ -42,12 +58,22 @@ class AgentRegistry:
     
     def __init__(self):
         self._agents: Dict[str, AgentConfig] = {}
+        self._context_cache: Optional[str] = None
     
     def register(self, agent_config: AgentConfig):
         """Register a new agent"""
         self._agents[agent_config.name] = agent_config
+        self._context_cache = None
         print(f"✓ Registered agent: {agent_config.name}")
     
+    def register_many(self, agent_configs: Iterable[AgentConfig]):
+        """Register several agents at once"""
+        added = {agent.name: agent for agent in agent_configs}
+        self._agents.update(added)
+        self._context_cache = None
+        if added:
+            print("\n".join(f"✓ Registered agent: {name}" for name in added))
+    
     def register_from_dict(self, config: Dict[str, Any]):
         """Register agent from dictionary configuration"""
         agent = AgentConfig(**config)
@@ -58,8 +84,7 @@ class AgentRegistry:
         path = Path(config_file)
         
         if path.suffix == '.json':
-            with open(path) as f:
-                configs = json.load(f)
+            configs = serialization.load_json(path)
         else:
             raise ValueError(f"Unsupported config file format: {path.suffix}")
         
@@ -85,44 +110,72 @@ class AgentRegistry:
         ]
     
     def to_prompt_context(self) -> str:
-        """Generate prompt context describing all available agents"""
+        """
+        Generate prompt context describing all available agents.
+        The result is cached until another agent is registered.
+        """
         if not self._agents:
             return "No agents registered."
         
-        context = "AVAILABLE AGENTS:\n\n"
-        for name, agent in self._agents.items():
-            context += f"• {name}\n"
-            context += f"  Description: {agent.description}\n"
-            context += f"  Capabilities: {', '.join(agent.capabilities)}\n"
-            context += f"  Tools: {', '.join(agent.tools)}\n\n"
+        if self._context_cache is None:
+            parts = ["AVAILABLE AGENTS:\n\n"]
+            for name, agent in self._agents.items():
+                parts.append(
+                    f"• {name}\n"
+                    f"  Description: {agent.description}\n"
+                    f"  Capabilities: {', '.join(agent.capabilities)}\n"
+                    f"  Tools: {', '.join(agent.tools)}\n\n"
+                )
+            self._context_cache = "".join(parts)
         
-        return context
+        return self._context_cache
 
 
 # ============================================================================
 # Activity Tracking - Monitor Agent Behavior
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class AgentActivity:
     """Track individual agent activities"""
     agent_name: str
     tool_name: str
-    timestamp: str
+    timestamp_ns: int  # time.perf_counter_ns() when the tool call started
     input_data: Dict[str, Any]
     output_data: Dict[str, Any] = field(default_factory=dict)
     parent_tool_id: str = None
+    tool_use_id: Optional[str] = None
 
 
 class ActivityTracker:
     """
     Tracks all agent activities using SDK hooks.
     Provides detailed visibility into what each agent is doing.
+    
+    Only the most recent max_activities are kept, so long-running sessions
+    use bounded memory. If log_path is given, every completed activity is
+    also appended to that file as one JSON line.
     """
     
-    def __init__(self):
-        self.activities: List[AgentActivity] = []
+    LOG_BATCH_SIZE = 100
+    LOG_BATCH_DELAY = 0.1  # seconds
+    
+    def __init__(self, max_activities: int = 10_000, log_path: Optional[Path] = None):
+        self.max_activities = max_activities
+        self.activities: Deque[AgentActivity] = deque(maxlen=max_activities)
+        self._by_agent: Dict[str, Deque[AgentActivity]] = defaultdict(deque)
         self.subagent_map: Dict[str, str] = {}  # tool_use_id -> agent_name
+        self._in_flight: Dict[str, AgentActivity] = {}  # tool_use_id -> activity
+        self.total_tool_calls = 0
+        self.tool_counts: Counter = Counter()  # tool_name -> calls, over the whole session
+        # Wall-clock anchor for turning perf_counter_ns() readings into datetimes
+        self._epoch_start = time.time()
+        self._start_ns = time.perf_counter_ns()
+        # Line-delimited JSON log, written in batches
+        self.log_path = Path(log_path) if log_path else None
+        self._log_file = None
+        self._batch: List[bytes] = []
+        self._last_flush = time.monotonic()
         
     def pre_tool_use_hook(
         self, 
@@ -147,11 +200,27 @@ class ActivityTracker:
         activity = AgentActivity(
             agent_name=agent_name,
             tool_name=tool_name,
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.perf_counter_ns(),
             input_data=input_data,
-            parent_tool_id=parent_id
+            parent_tool_id=parent_id,
+            tool_use_id=tool_use_id
         )
+        if len(self.activities) == self.max_activities:
+            # The oldest activity is about to be evicted - drop it from the indexes
+            # too (a denied or aborted call never gets its post hook)
+            evicted = self.activities[0]
+            if evicted.tool_use_id:
+                self._in_flight.pop(evicted.tool_use_id, None)
+            agent_log = self._by_agent[evicted.agent_name]
+            agent_log.popleft()
+            if not agent_log:
+                del self._by_agent[evicted.agent_name]
         self.activities.append(activity)
+        self._by_agent[agent_name].append(activity)
+        self.total_tool_calls += 1
+        self.tool_counts[tool_name] += 1
+        if tool_use_id:
+            self._in_flight[tool_use_id] = activity
         
         return {}  # No modification to tool execution
     
@@ -163,58 +232,95 @@ class ActivityTracker:
         context: Any
     ) -> Dict[str, Any]:
         """Called after each tool execution"""
-        # Update the last activity with output
-        if self.activities:
-            self.activities[-1].output_data = output_data
+        # Background subagents interleave tool calls, so match on tool_use_id.
+        # The most recent activity is only a fallback when the SDK gives no id.
+        if tool_use_id:
+            activity = self._in_flight.pop(tool_use_id, None)
+        elif self.activities and not self.activities[-1].output_data:
+            activity = self.activities[-1]
+        else:
+            activity = None
+        
+        if activity is not None:
+            activity.output_data = output_data
+            if self.log_path:
+                self._log_activity(activity)
         
         return {}
     
+    def _log_activity(self, activity: AgentActivity):
+        """Queue a completed activity for the JSONL log"""
+        record = self._timeline_entry(activity)
+        self._batch.append(serialization.dumps(record, default=str) + b"\n")
+        if (len(self._batch) >= self.LOG_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= self.LOG_BATCH_DELAY):
+            self.flush()
+    
+    def flush(self):
+        """Write any queued activities to the JSONL log"""
+        self._last_flush = time.monotonic()
+        if not self._batch:
+            return
+        if self._log_file is None:
+            self._log_file = open(self.log_path, "ab", buffering=0)
+        self._log_file.write(b"".join(self._batch))
+        self._batch.clear()
+    
+    def close(self):
+        """Flush pending activities and close the JSONL log"""
+        if self.log_path:
+            self.flush()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+    
     def print_summary(self):
         """Print a human-readable activity summary"""
-        print("\n" + "="*70)
-        print("AGENT ACTIVITY SUMMARY")
-        print("="*70)
+        lines = ["\n" + "="*70, "AGENT ACTIVITY SUMMARY", "="*70]
         
-        # Group by agent
-        agent_groups = {}
-        for activity in self.activities:
-            if activity.agent_name not in agent_groups:
-                agent_groups[activity.agent_name] = []
-            agent_groups[activity.agent_name].append(activity)
-        
-        for agent_name, activities in agent_groups.items():
-            print(f"\n[{agent_name}] - {len(activities)} tool calls")
+        # Activities are already grouped by agent as they are recorded
+        for agent_name, activities in self._by_agent.items():
+            lines.append(f"\n[{agent_name}] - {len(activities)} tool calls")
             for activity in activities:
-                print(f"  → {activity.tool_name}")
-                if "query" in str(activity.input_data).lower():
-                    query_text = activity.input_data.get("tool_input", {}).get("query", "")
-                    if query_text:
-                        print(f"    Query: {query_text[:80]}...")
-                elif activity.tool_name == "Write":
-                    path = activity.input_data.get("tool_input", {}).get("path", "")
-                    if path:
-                        print(f"    File: {path}")
-                elif activity.tool_name == "Read":
-                    path = activity.input_data.get("tool_input", {}).get("path", "")
+                lines.append(f"  → {activity.tool_name}")
+                tool_input = activity.input_data.get("tool_input", {})
+                query_text = tool_input.get("query")
+                if query_text:
+                    lines.append(f"    Query: {query_text[:80]}...")
+                elif activity.tool_name in ("Write", "Read"):
+                    path = tool_input.get("path", "")
                     if path:
-                        print(f"    File: {path}")
+                        lines.append(f"    File: {path}")
         
-        print("\n" + "="*70)
+        lines.append("\n" + "="*70)
+        print("\n".join(lines))
     
     def get_activities_by_agent(self, agent_name: str) -> List[AgentActivity]:
         """Get all activities for a specific agent"""
-        return [a for a in self.activities if a.agent_name == agent_name]
+        return list(self._by_agent.get(agent_name, ()))
+    
+    def format_timestamp(self, timestamp_ns: int) -> str:
+        """Convert a recorded perf_counter_ns() reading to an ISO timestamp"""
+        elapsed = (timestamp_ns - self._start_ns) / 1e9
+        return datetime.fromtimestamp(self._epoch_start + elapsed).isoformat()
+    
+    def _timeline_entry(self, activity: AgentActivity) -> Dict[str, Any]:
+        """Convert an activity to a plain dict with an ISO timestamp"""
+        # Read the slots directly - asdict() would deep-copy every payload
+        entry = {name: getattr(activity, name) for name in AgentActivity.__slots__}
+        entry["timestamp"] = self.format_timestamp(entry.pop("timestamp_ns"))
+        return entry
     
     def get_activity_timeline(self) -> List[Dict[str, Any]]:
         """Get chronological timeline of all activities"""
-        return [asdict(a) for a in self.activities]
+        return [self._timeline_entry(a) for a in self.activities]
 
 
 # ============================================================================
 # Task Decomposition with Planning
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class SubTask:
     """Represents a decomposed subtask"""
     id: str
@@ -239,12 +345,13 @@ class FlexibleOrchestrator:
     ):
         self.registry = agent_registry
         self.workspace = Path(workspace_dir)
-        self.workspace.mkdir(exist_ok=True)
+        ensure_dir(self.workspace)
         self.subtasks: List[SubTask] = []
         
         # Activity tracking (optional)
         self.enable_tracking = enable_tracking
-        self.tracker = ActivityTracker() if enable_tracking else None
+        self.activity_log = self.workspace / "activities.jsonl"
+        self.tracker = ActivityTracker(log_path=self.activity_log) if enable_tracking else None
     
     def _create_orchestrator_prompt(self, task: str) -> str:
         """
@@ -384,8 +491,13 @@ Begin by decomposing this task and creating your execution plan.
         print("=" * 70)
         
         # Execute with planning
-        async for message in query(prompt=orchestrator_prompt, options=options):
-            print(message)
+        try:
+            with MessagePrinter() as printer:
+                async for message in query(prompt=orchestrator_prompt, options=options):
+                    printer.print(message)
+        finally:
+            if self.tracker:
+                self.tracker.close()
         
         # Collect results
         results = {
@@ -396,26 +508,36 @@ Begin by decomposing this task and creating your execution plan.
         }
         
         # Gather all output files
-        for file_path in self.workspace.glob("**/*"):
-            if file_path.is_file():
+        activity_log = str(self.activity_log)
+        for root, _dirs, names in os.walk(self.workspace):
+            for name in names:
+                full_path = os.path.join(root, name)
+                if full_path == activity_log:
+                    continue
+                try:
+                    size = os.stat(full_path).st_size
+                except OSError:  # e.g. a dangling symlink
+                    continue
                 results["output_files"].append({
-                    "path": str(file_path),
-                    "name": file_path.name,
-                    "size": file_path.stat().st_size
+                    "path": full_path,
+                    "name": name,
+                    "size": size
                 })
         
         # Print activity summary if tracking is enabled
         if self.enable_tracking and self.tracker:
             self.tracker.print_summary()
             results["activity_timeline"] = self.tracker.get_activity_timeline()
-            results["total_tool_calls"] = len(self.tracker.activities)
+            results["total_tool_calls"] = self.tracker.total_tool_calls
+            results["tool_counts"] = dict(self.tracker.tool_counts)
+            results["activity_log"] = str(self.activity_log)
         
         print("\n" + "=" * 70)
         print("ORCHESTRATION COMPLETE")
         print("=" * 70)
         print(f"Output files: {len(results['output_files'])}")
         if self.enable_tracking and self.tracker:
-            print(f"Total tool calls: {len(self.tracker.activities)}")
+            print(f"Total tool calls: {self.tracker.total_tool_calls}")
         
         return results
 
@@ -424,57 +546,63 @@ Begin by decomposing this task and creating your execution plan.
 # Agent Configuration Examples
 # ============================================================================
 
-def create_default_agents() -> AgentRegistry:
-    """
-    Create a registry with some default agents.
-    Users can add their own or replace these.
-    """
-    registry = AgentRegistry()
-    
-    # Web Researcher Agent
-    registry.register(AgentConfig(
-        name="web-researcher",
-        description="Searches the web and gathers information from online sources",
-        tools=["WebSearch", "WebFetch", "Write", "Read"],
-        capabilities=["web-search", "information-gathering", "research"],
-        system_prompt="""You are a web research specialist.
+@functools.lru_cache(maxsize=1)
+def _build_default_configs() -> Tuple[AgentConfig, ...]:
+    """Build the default agent configs once; registries get copies of these"""
+    return (
+        # Web Researcher Agent
+        AgentConfig(
+            name="web-researcher",
+            description="Searches the web and gathers information from online sources",
+            tools=["WebSearch", "WebFetch", "Write", "Read"],
+            capabilities=["web-search", "information-gathering", "research"],
+            system_prompt="""You are a web research specialist.
 Your job is to search the web, find relevant information, and compile findings.
 Always cite your sources and save your research to markdown files."""
-    ))
-    
-    # Data Analyst Agent
-    registry.register(AgentConfig(
-        name="data-analyst",
-        description="Analyzes data, creates visualizations, and generates insights",
-        tools=["Read", "Write", "Bash"],
-        capabilities=["data-analysis", "visualization", "statistics"],
-        system_prompt="""You are a data analysis specialist.
+        ),
+
+        # Data Analyst Agent
+        AgentConfig(
+            name="data-analyst",
+            description="Analyzes data, creates visualizations, and generates insights",
+            tools=["Read", "Write", "Bash"],
+            capabilities=["data-analysis", "visualization", "statistics"],
+            system_prompt="""You are a data analysis specialist.
 Your job is to analyze data, create visualizations, and generate actionable insights.
 Use Python scripts when needed for complex analysis."""
-    ))
-    
-    # Technical Writer Agent
-    registry.register(AgentConfig(
-        name="technical-writer",
-        description="Creates documentation, reports, and technical content",
-        tools=["Read", "Write"],
-        capabilities=["documentation", "writing", "content-creation"],
-        system_prompt="""You are a technical writing specialist.
+        ),
+
+        # Technical Writer Agent
+        AgentConfig(
+            name="technical-writer",
+            description="Creates documentation, reports, and technical content",
+            tools=["Read", "Write"],
+            capabilities=["documentation", "writing", "content-creation"],
+            system_prompt="""You are a technical writing specialist.
 Your job is to create clear, well-structured documentation and reports.
 Use proper markdown formatting and organize content logically."""
-    ))
-    
-    # Code Generator Agent
-    registry.register(AgentConfig(
-        name="code-generator",
-        description="Writes code in various programming languages",
-        tools=["Write", "Read", "Bash"],
-        capabilities=["coding", "programming", "software-development"],
-        system_prompt="""You are a software development specialist.
+        ),
+
+        # Code Generator Agent
+        AgentConfig(
+            name="code-generator",
+            description="Writes code in various programming languages",
+            tools=["Write", "Read", "Bash"],
+            capabilities=["coding", "programming", "software-development"],
+            system_prompt="""You are a software development specialist.
 Your job is to write clean, well-documented, production-ready code.
 Follow best practices and include error handling."""
-    ))
-    
+        ),
+    )
+
+
+def create_default_agents() -> AgentRegistry:
+    """
+    Create a registry with some default agents.
+    Users can add their own or replace these.
+    """
+    registry = AgentRegistry()
+    registry.register_many(config.copy() for config in _build_default_configs())
     return registry
 
 
@@ -606,7 +734,7 @@ async def example_load_from_config():
     ]
     
     config_file = Path("./agent_config.json")
-    config_file.write_text(json.dumps(config, indent=2))
+    serialization.dump_json(config, config_file)
     
     # Load agents from config
     registry = load_custom_agents_from_json(str(config_file))
@@ -690,9 +818,10 @@ async def example_with_activity_tracking():
     3. Create a comparison report
     """
     
+    # No plan review needed here - the point is the activity log
     result = await orchestrator.execute(
         task=task,
-        permission_mode="plan"
+        permission_mode="acceptEdits"
     )
     
     # Access activity data
@@ -702,14 +831,9 @@ async def example_with_activity_tracking():
         print("="*70)
         print(f"Total activities tracked: {result['total_tool_calls']}")
         
-        # Group by tool type
-        tool_counts = {}
-        for activity in result["activity_timeline"]:
-            tool = activity["tool_name"]
-            tool_counts[tool] = tool_counts.get(tool, 0) + 1
-        
+        # Counted by the tracker as tool calls came in
         print("\nTool usage breakdown:")
-        for tool, count in sorted(tool_counts.items(), key=lambda x: x[1], reverse=True):
+        for tool, count in Counter(result["tool_counts"]).most_common():
             print(f"  {tool}: {count} calls")
     
     return result
@@ -745,6 +869,17 @@ async def example_without_tracking():
 # Main Entry Point
 # ============================================================================
 
+# Examples offered by main(), in menu order
+_EXAMPLES = (
+    ("Default Agents (pre-configured)", example_with_default_agents),
+    ("Custom Agents (register dynamically)", example_with_custom_agents),
+    ("Load from Config File", example_load_from_config),
+    ("Runtime Registration", example_runtime_agent_registration),
+    ("With Activity Tracking (detailed monitoring)", example_with_activity_tracking),
+    ("Without Tracking (faster execution)", example_without_tracking),
+)
+
+
 async def main():
     """
     Demonstrate flexible agent orchestration
@@ -757,23 +892,16 @@ async def main():
     ╚══════════════════════════════════════════════════════════════════╝
     """)
     
-    examples = {
-        "1": ("Default Agents (pre-configured)", example_with_default_agents),
-        "2": ("Custom Agents (register dynamically)", example_with_custom_agents),
-        "3": ("Load from Config File", example_load_from_config),
-        "4": ("Runtime Registration", example_runtime_agent_registration),
-        "5": ("With Activity Tracking (detailed monitoring)", example_with_activity_tracking),
-        "6": ("Without Tracking (faster execution)", example_without_tracking)
-    }
-    
     print("Available examples:")
-    for key, (name, _) in examples.items():
-        print(f"  {key}. {name}")
+    for i, (name, _) in enumerate(_EXAMPLES, 1):
+        print(f"  {i}. {name}")
     
     choice = input("\nSelect example (1-6): ").strip()
     
-    if choice in examples:
-        name, func = examples[choice]
+    index = int(choice) - 1 if choice.isdigit() else -1
+    
+    if 0 <= index < len(_EXAMPLES):
+        name, func = _EXAMPLES[index]
         print(f"\n\nRunning: {name}\n")
         result = await func()
         
@@ -787,7 +915,7 @@ async def main():
                 print(f"  • {file_info['name']} ({file_info['size']} bytes)")
     else:
         print("Invalid choice. Running example 1 by default.")
-        await examples["1"][1]()
+        await _EXAMPLES[0][1]()
 
 
 if __name__ == "__main__":
@@ -11,11 +11,16 @@ Features:
 """
 
 import asyncio
-import json
+import functools
+import os
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
-from dataclasses import dataclass, field, asdict
-from claude_agent_sdk import query, ClaudeAgentOptions
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Callable
+from dataclasses import dataclass, field, replace, asdict
+from claude_agent_sdk import query, ClaudeAgentOptions, AssistantMessage, TextBlock
+
+import serialization
+from fileutils import ensure_dir
 
 
 # ============================================================================
@@ -31,6 +36,15 @@ class AgentConfig:
     system_prompt: str
     capabilities: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    def copy(self) -> "AgentConfig":
+        """Return a copy whose tools, capabilities and metadata are not shared"""
+        return replace(
+            self,
+            tools=list(self.tools),
+            capabilities=list(self.capabilities),
+            metadata=dict(self.metadata)
+        )
 
 
 class AgentRegistry:
@@ -41,12 +55,22 @@ class AgentRegistry:
     
     def __init__(self):
         self._agents: Dict[str, AgentConfig] = {}
+        self._context_cache: Optional[str] = None
     
     def register(self, agent_config: AgentConfig):
         """Register a new agent"""
         self._agents[agent_config.name] = agent_config
+        self._context_cache = None
         print(f"✓ Registered agent: {agent_config.name}")
     
+    def register_many(self, agent_configs: Iterable[AgentConfig]):
+        """Register several agents at once"""
+        added = {agent.name: agent for agent in agent_configs}
+        self._agents.update(added)
+        self._context_cache = None
+        if added:
+            print("\n".join(f"✓ Registered agent: {name}" for name in added))
+    
     def register_from_dict(self, config: Dict[str, Any]):
         """Register agent from dictionary configuration"""
         agent = AgentConfig(**config)
@@ -57,8 +81,7 @@ class AgentRegistry:
         path = Path(config_file)
         
         if path.suffix == '.json':
-            with open(path) as f:
-                configs = json.load(f)
+            configs = serialization.load_json(path)
         else:
             raise ValueError(f"Unsupported config file format: {path.suffix}")
         
@@ -84,18 +107,76 @@ class AgentRegistry:
         ]
     
     def to_prompt_context(self) -> str:
-        """Generate prompt context describing all available agents"""
+        """
+        Generate prompt context describing all available agents.
+        The result is cached until another agent is registered.
+        """
         if not self._agents:
             return "No agents registered."
         
-        context = "AVAILABLE AGENTS:\n\n"
-        for name, agent in self._agents.items():
-            context += f"• {name}\n"
-            context += f"  Description: {agent.description}\n"
-            context += f"  Capabilities: {', '.join(agent.capabilities)}\n"
-            context += f"  Tools: {', '.join(agent.tools)}\n\n"
+        if self._context_cache is None:
+            parts = ["AVAILABLE AGENTS:\n\n"]
+            for name, agent in self._agents.items():
+                parts.append(
+                    f"• {name}\n"
+                    f"  Description: {agent.description}\n"
+                    f"  Capabilities: {', '.join(agent.capabilities)}\n"
+                    f"  Tools: {', '.join(agent.tools)}\n\n"
+                )
+            self._context_cache = "".join(parts)
         
-        return context
+        return self._context_cache
+
+
+# ============================================================================
+# Message Streaming
+# ============================================================================
+
+class MessagePrinter:
+    """
+    Buffers streamed messages and writes them to stdout in batches.
+    The buffer is flushed once it exceeds max_bytes or max_delay seconds
+    after the first pending message, whichever comes first.
+    """
+    
+    def __init__(self, max_bytes: int = 8192, max_delay: float = 0.1):
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self._buf = bytearray()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._encoding = sys.stdout.encoding or "utf-8"
+    
+    def print(self, message: Any):
+        """Queue a message for output"""
+        self._buf += str(message).encode(self._encoding, errors="backslashreplace") + b"\n"
+        if len(self._buf) >= self.max_bytes:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+    
+    def flush(self):
+        """Write all queued messages to stdout"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buf:
+            return
+        # Flush the text layer first so earlier print() output stays in order
+        sys.stdout.flush()
+        stream = getattr(sys.stdout, "buffer", None)
+        if stream is not None:
+            stream.write(self._buf)
+            stream.flush()
+        else:
+            sys.stdout.write(self._buf.decode(self._encoding, errors="replace"))
+            sys.stdout.flush()
+        self._buf.clear()
+    
+    def __enter__(self) -> "MessagePrinter":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.flush()
 
 
 # ============================================================================
@@ -113,6 +194,234 @@ class SubTask:
     status: str = "pending"  # pending, running, completed, failed
 
 
+class SubTaskGraph:
+    """
+    Dependency graph over a list of subtasks.
+    Adjacency, in-degrees and depth levels are computed once at construction,
+    so scheduling queries are plain dict lookups. Duplicate ids, unknown
+    dependencies, cycles and (if a registry is given) unregistered agents
+    raise ValueError immediately.
+    """
+    
+    def __init__(self, subtasks: List[SubTask], agent_registry: Optional[AgentRegistry] = None):
+        seen: Set[str] = set()
+        for t in subtasks:
+            if t.id in seen:
+                raise ValueError(f"Duplicate subtask id: {t.id}")
+            seen.add(t.id)
+        
+        if agent_registry is not None:
+            for t in subtasks:
+                if agent_registry.get(t.agent_name) is None:
+                    raise ValueError(f"Subtask {t.id} uses unregistered agent: {t.agent_name}")
+        
+        self._by_id: Dict[str, SubTask] = {t.id: t for t in subtasks}
+        self._children: Dict[str, List[str]] = {t.id: [] for t in subtasks}
+        self._parents: Dict[str, List[str]] = {}
+        self._indeg: Dict[str, int] = {}
+        for t in subtasks:
+            for dep in t.dependencies:
+                if dep not in self._by_id:
+                    raise ValueError(f"Subtask {t.id} depends on unknown subtask: {dep}")
+                self._children[dep].append(t.id)
+            self._parents[t.id] = list(t.dependencies)
+            self._indeg[t.id] = len(t.dependencies)
+        
+        # Topological sort into depth levels (Kahn's algorithm)
+        indeg = dict(self._indeg)
+        self._levels: List[List[SubTask]] = []
+        level = [t for t in subtasks if indeg[t.id] == 0]
+        while level:
+            self._levels.append(level)
+            next_level = []
+            for t in level:
+                for child in self._children[t.id]:
+                    indeg[child] -= 1
+                    if indeg[child] == 0:
+                        next_level.append(self._by_id[child])
+            level = next_level
+        
+        if sum(len(l) for l in self._levels) != len(subtasks):
+            cyclic = sorted(tid for tid, n in indeg.items() if n > 0)
+            raise ValueError(f"Cyclic dependency between subtasks: {cyclic}")
+    
+    def get(self, task_id: str) -> SubTask:
+        """Get a subtask by id"""
+        return self._by_id[task_id]
+    
+    def get_dependencies(self, task_id: str) -> List[str]:
+        """Ids of the subtasks that task_id depends on"""
+        return self._parents[task_id]
+    
+    def get_dependents(self, task_id: str) -> List[str]:
+        """Ids of the subtasks that depend on task_id"""
+        return self._children[task_id]
+    
+    def in_degrees(self) -> Dict[str, int]:
+        """Fresh copy of the dependency counts, for schedulers to decrement"""
+        return dict(self._indeg)
+    
+    def get_roots(self) -> List[SubTask]:
+        """Subtasks without dependencies"""
+        return list(self._levels[0]) if self._levels else []
+    
+    def get_leaves(self) -> List[SubTask]:
+        """Subtasks nothing else depends on"""
+        return [t for tid, t in self._by_id.items() if not self._children[tid]]
+    
+    def get_tasks_at_depth(self, depth: int) -> List[SubTask]:
+        """Subtasks whose longest dependency chain has the given length"""
+        if 0 <= depth < len(self._levels):
+            return list(self._levels[depth])
+        return []
+    
+    @property
+    def levels(self) -> List[List[SubTask]]:
+        """All depth levels in execution order"""
+        return [list(level) for level in self._levels]
+
+
+class DAGExecutor:
+    """
+    Executes decomposed subtasks client-side as a dependency DAG.
+    Each subtask gets its own query() stream and is started as soon as all
+    of its dependencies have completed, optionally capped at max_parallel
+    concurrent agents.
+    """
+    
+    def __init__(
+        self,
+        agent_registry: AgentRegistry,
+        subtasks: List[SubTask],
+        workspace: Path,
+        permission_mode: str = "acceptEdits",
+        max_parallel: Optional[int] = None
+    ):
+        self.registry = agent_registry
+        self.subtasks = subtasks
+        self.workspace = workspace
+        self.permission_mode = permission_mode
+        self.max_parallel = max_parallel
+        self.outputs: Dict[str, str] = {}
+    
+    def _create_subtask_prompt(self, subtask: SubTask) -> str:
+        """Build the prompt for one subtask, injecting only its prerequisites' outputs"""
+        prompt = subtask.description
+        if subtask.expected_output:
+            prompt += f"\n\nEXPECTED OUTPUT:\n{subtask.expected_output}"
+        if subtask.dependencies:
+            prompt += "\n\nOUTPUTS FROM PREREQUISITE SUBTASKS:\n"
+            prompt += "".join(
+                f"\n[{dep}]:\n{self.outputs[dep]}\n" for dep in subtask.dependencies
+            )
+        return prompt
+    
+    async def _run_agent(self, subtask: SubTask) -> str:
+        """Run a single subtask with its registered agent and return its text output"""
+        agent = self.registry.get(subtask.agent_name)
+        if agent is None:
+            raise ValueError(f"Subtask {subtask.id} uses unregistered agent: {subtask.agent_name}")
+        
+        options = ClaudeAgentOptions(
+            cwd=str(self.workspace),
+            allowed_tools=agent.tools,
+            permission_mode=self.permission_mode,
+            system_prompt=agent.system_prompt
+        )
+        
+        print(f"→ [{subtask.id}] {subtask.agent_name} started")
+        subtask.status = "running"
+        output = []
+        try:
+            async for message in query(prompt=self._create_subtask_prompt(subtask), options=options):
+                if isinstance(message, AssistantMessage):
+                    for block in message.content:
+                        if isinstance(block, TextBlock):
+                            output.append(block.text)
+        except asyncio.CancelledError:
+            # A sibling failed and run() is cancelling the rest
+            subtask.status = "cancelled"
+            print(f"✗ [{subtask.id}] {subtask.agent_name} cancelled")
+            raise
+        except Exception:
+            subtask.status = "failed"
+            raise
+        
+        subtask.status = "completed"
+        print(f"✓ [{subtask.id}] {subtask.agent_name} complete")
+        return "\n".join(output)
+    
+    async def run(self) -> Dict[str, str]:
+        """
+        Execute all subtasks in dependency order (Kahn's algorithm).
+        
+        Subtasks are dispatched from a ready frontier rather than in waves,
+        so a slow agent only delays the subtasks that actually depend on it.
+        If any subtask fails, the ones still running are cancelled.
+        
+        Returns:
+            Mapping of subtask id to the agent's text output
+        """
+        graph = SubTaskGraph(self.subtasks, self.registry)  # validates before anything runs
+        indeg = graph.in_degrees()
+        semaphore = asyncio.Semaphore(self.max_parallel) if self.max_parallel else None
+        
+        async def run_one(subtask: SubTask):
+            if semaphore is None:
+                return subtask, await self._run_agent(subtask)
+            async with semaphore:
+                return subtask, await self._run_agent(subtask)
+        
+        running = {asyncio.create_task(run_one(t)) for t in graph.get_roots()}
+        try:
+            while running:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    subtask, output = finished.result()
+                    self.outputs[subtask.id] = output
+                    for child in graph.get_dependents(subtask.id):
+                        indeg[child] -= 1
+                        if indeg[child] == 0:
+                            running.add(asyncio.create_task(run_one(graph.get(child))))
+        finally:
+            for pending in running:
+                pending.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        
+        return self.outputs
+
+
+# Generic decomposition example shown to the lead orchestrator when no
+# explicit subtasks have been provided
+_EXAMPLE_DECOMPOSITION = """EXAMPLE TASK DECOMPOSITION WITH OUTPUT PASSING:
+
+Task: "Research AI and create report"
+
+Decomposition:
+- Subtask 1: web-researcher 
+  * Action: "Search for AI trends"
+  * OUTPUT FILE: ai_trends.md
+  * Dependencies: None
+
+- Subtask 2: web-researcher
+  * Action: "Search for AI companies"
+  * OUTPUT FILE: ai_companies.md  
+  * Dependencies: None
+
+- Subtask 3: data-analyst
+  * Action: "Read ai_trends.md and ai_companies.md, analyze data"
+  * INPUT FILES: ai_trends.md, ai_companies.md (from Subtasks 1, 2)
+  * OUTPUT FILE: analysis.json
+  * Dependencies: Subtask 1, 2
+
+- Subtask 4: technical-writer
+  * Action: "Read analysis.json and create final report"
+  * INPUT FILE: analysis.json (from Subtask 3)
+  * OUTPUT FILE: final_report.md
+  * Dependencies: Subtask 3"""
+
+
 class FlexibleOrchestrator:
     """
     Flexible orchestrator that works with any registered agents.
@@ -126,14 +435,56 @@ class FlexibleOrchestrator:
     ):
         self.registry = agent_registry
         self.workspace = Path(workspace_dir)
-        self.workspace.mkdir(exist_ok=True)
+        ensure_dir(self.workspace)
         self.subtasks: List[SubTask] = []
+        self._waves: Optional[List[List[SubTask]]] = None
+        self._waves_signature: Optional[tuple] = None
+    
+    def _compute_waves(self) -> List[List[SubTask]]:
+        """
+        Group self.subtasks into dependency waves using Kahn's algorithm.
+        Every subtask in a wave depends only on subtasks in earlier waves.
+        The result is cached until the subtasks or their dependencies change.
+        """
+        signature = tuple((t.id, tuple(t.dependencies)) for t in self.subtasks)
+        if self._waves is not None and signature == self._waves_signature:
+            return self._waves
+        
+        if not any(t.dependencies for t in self.subtasks):
+            # Sparse fast path - everything can run in a single wave
+            waves = [list(self.subtasks)] if self.subtasks else []
+        else:
+            waves = SubTaskGraph(self.subtasks).levels
+        
+        self._waves = waves
+        self._waves_signature = signature
+        return waves
+    
+    def _waves_prompt_context(self) -> str:
+        """Describe the precomputed execution waves for the lead orchestrator"""
+        parts = ["PRECOMPUTED EXECUTION WAVES (dependencies already resolved):\n\n"]
+        for i, wave in enumerate(self._compute_waves(), 1):
+            parts.append(f"Wave {i}: [{', '.join(t.id for t in wave)}]\n")
+        parts.append("\nSUBTASKS:\n")
+        for t in self.subtasks:
+            parts.append(f"- {t.id} ({t.agent_name}): {t.description}\n")
+            if t.expected_output:
+                parts.append(f"  Expected output: {t.expected_output}\n")
+        parts.append(
+            "\nRun all subtasks of a wave in parallel (run_in_background: true) "
+            "and start a wave only after the previous one has completed."
+        )
+        return "".join(parts)
     
     def _create_orchestrator_prompt(self, task: str) -> str:
         """
         Create prompt for lead orchestrator that uses registered agents
         """
         agent_context = self.registry.to_prompt_context()
+        if self.subtasks:
+            planning_context = self._waves_prompt_context()
+        else:
+            planning_context = _EXAMPLE_DECOMPOSITION
         
         return f"""You are a LEAD ORCHESTRATOR that coordinates specialized agents.
 
@@ -168,32 +519,7 @@ YOUR WORKFLOW (with permission_mode="plan", you'll show this plan first):
    - Save to final_result.md
    
 
-EXAMPLE TASK DECOMPOSITION WITH OUTPUT PASSING:
-
-Task: "Research AI and create report"
-
-Decomposition:
-- Subtask 1: web-researcher 
-  * Action: "Search for AI trends"
-  * OUTPUT FILE: ai_trends.md
-  * Dependencies: None
-
-- Subtask 2: web-researcher
-  * Action: "Search for AI companies"
-  * OUTPUT FILE: ai_companies.md  
-  * Dependencies: None
-
-- Subtask 3: data-analyst
-  * Action: "Read ai_trends.md and ai_companies.md, analyze data"
-  * INPUT FILES: ai_trends.md, ai_companies.md (from Subtasks 1, 2)
-  * OUTPUT FILE: analysis.json
-  * Dependencies: Subtask 1, 2
-
-- Subtask 4: technical-writer
-  * Action: "Read analysis.json and create final report"
-  * INPUT FILE: analysis.json (from Subtask 3)
-  * OUTPUT FILE: final_report.md
-  * Dependencies: Subtask 3
+{planning_context}
 
 CRITICAL - OUTPUT PASSING:
 When spawning agents with Task tool, explicitly specify:
@@ -261,8 +587,9 @@ Begin by decomposing this task and creating your execution plan.
         print("=" * 70)
         
         # Execute with planning
-        async for message in query(prompt=orchestrator_prompt, options=options):
-            print(message)
+        with MessagePrinter() as printer:
+            async for message in query(prompt=orchestrator_prompt, options=options):
+                printer.print(message)
         
         # Collect results
         results = {
@@ -273,12 +600,17 @@ Begin by decomposing this task and creating your execution plan.
         }
         
         # Gather all output files
-        for file_path in self.workspace.glob("**/*"):
-            if file_path.is_file():
+        for root, _dirs, names in os.walk(self.workspace):
+            for name in names:
+                full_path = os.path.join(root, name)
+                try:
+                    size = os.stat(full_path).st_size
+                except OSError:  # e.g. a dangling symlink
+                    continue
                 results["output_files"].append({
-                    "path": str(file_path),
-                    "name": file_path.name,
-                    "size": file_path.stat().st_size
+                    "path": full_path,
+                    "name": name,
+                    "size": size
                 })
         
         print("\n" + "=" * 70)
@@ -288,62 +620,112 @@ Begin by decomposing this task and creating your execution plan.
         
         return results
 
+    async def execute_subtasks(
+        self,
+        subtasks: Optional[List[SubTask]] = None,
+        permission_mode: str = "acceptEdits",
+        max_parallel: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute an explicit subtask decomposition without a lead LLM call.
+        
+        Independent subtasks run concurrently, so wall-clock time follows the
+        longest dependency chain rather than the sum of all agent runs.
+        
+        Args:
+            subtasks: Subtasks to run (defaults to self.subtasks)
+            permission_mode: Permission mode for every agent
+            max_parallel: Maximum number of agents running at once (unbounded if None)
+            
+        Returns:
+            Results dictionary with per-subtask outputs
+        """
+        if subtasks is not None:
+            self.subtasks = subtasks
+        
+        print(f"\n{'='*70}")
+        print("FLEXIBLE ORCHESTRATOR - DAG EXECUTION")
+        print(f"{'='*70}\n")
+        print(f"Subtasks: {len(self.subtasks)}")
+        print(f"Workspace: {self.workspace}\n")
+        
+        executor = DAGExecutor(
+            self.registry, self.subtasks, self.workspace, permission_mode, max_parallel
+        )
+        outputs = await executor.run()
+        
+        print("\n" + "=" * 70)
+        print("DAG EXECUTION COMPLETE")
+        print("=" * 70)
+        
+        return {
+            "workspace": str(self.workspace),
+            "subtask_outputs": outputs,
+            "status": "completed"
+        }
+
 
 # ============================================================================
 # Agent Configuration Examples
 # ============================================================================
 
-def create_default_agents() -> AgentRegistry:
-    """
-    Create a registry with some default agents.
-    Users can add their own or replace these.
-    """
-    registry = AgentRegistry()
-    
-    # Web Researcher Agent
-    registry.register(AgentConfig(
-        name="web-researcher",
-        description="Searches the web and gathers information from online sources",
-        tools=["WebSearch", "WebFetch", "Write", "Read"],
-        capabilities=["web-search", "information-gathering", "research"],
-        system_prompt="""You are a web research specialist.
+@functools.lru_cache(maxsize=1)
+def _build_default_configs() -> Tuple[AgentConfig, ...]:
+    """Build the default agent configs once; registries get copies of these"""
+    return (
+        # Web Researcher Agent
+        AgentConfig(
+            name="web-researcher",
+            description="Searches the web and gathers information from online sources",
+            tools=["WebSearch", "WebFetch", "Write", "Read"],
+            capabilities=["web-search", "information-gathering", "research"],
+            system_prompt="""You are a web research specialist.
 Your job is to search the web, find relevant information, and compile findings.
 Always cite your sources and save your research to markdown files."""
-    ))
-    
-    # Data Analyst Agent
-    registry.register(AgentConfig(
-        name="data-analyst",
-        description="Analyzes data, creates visualizations, and generates insights",
-        tools=["Read", "Write", "Bash"],
-        capabilities=["data-analysis", "visualization", "statistics"],
-        system_prompt="""You are a data analysis specialist.
+        ),
+
+        # Data Analyst Agent
+        AgentConfig(
+            name="data-analyst",
+            description="Analyzes data, creates visualizations, and generates insights",
+            tools=["Read", "Write", "Bash"],
+            capabilities=["data-analysis", "visualization", "statistics"],
+            system_prompt="""You are a data analysis specialist.
 Your job is to analyze data, create visualizations, and generate actionable insights.
 Use Python scripts when needed for complex analysis."""
-    ))
-    
-    # Technical Writer Agent
-    registry.register(AgentConfig(
-        name="technical-writer",
-        description="Creates documentation, reports, and technical content",
-        tools=["Read", "Write"],
-        capabilities=["documentation", "writing", "content-creation"],
-        system_prompt="""You are a technical writing specialist.
+        ),
+
+        # Technical Writer Agent
+        AgentConfig(
+            name="technical-writer",
+            description="Creates documentation, reports, and technical content",
+            tools=["Read", "Write"],
+            capabilities=["documentation", "writing", "content-creation"],
+            system_prompt="""You are a technical writing specialist.
 Your job is to create clear, well-structured documentation and reports.
 Use proper markdown formatting and organize content logically."""
-    ))
-    
-    # Code Generator Agent
-    registry.register(AgentConfig(
-        name="code-generator",
-        description="Writes code in various programming languages",
-        tools=["Write", "Read", "Bash"],
-        capabilities=["coding", "programming", "software-development"],
-        system_prompt="""You are a software development specialist.
+        ),
+
+        # Code Generator Agent
+        AgentConfig(
+            name="code-generator",
+            description="Writes code in various programming languages",
+            tools=["Write", "Read", "Bash"],
+            capabilities=["coding", "programming", "software-development"],
+            system_prompt="""You are a software development specialist.
 Your job is to write clean, well-documented, production-ready code.
 Follow best practices and include error handling."""
-    ))
-    
+        ),
+    )
+
+
+def create_default_agents() -> AgentRegistry:
+    """
+    Create a registry with some default agents.
+    Users can add their own or replace these.
+    """
+    registry = AgentRegistry()
+    registry.register_many(config.copy() for config in _build_default_configs())
     return registry
 
 
@@ -475,7 +857,7 @@ async def example_load_from_config():
     ]
     
     config_file = Path("./agent_config.json")
-    config_file.write_text(json.dumps(config, indent=2))
+    serialization.dump_json(config, config_file)
     
     # Load agents from config
     registry = load_custom_agents_from_json(str(config_file))
@@ -541,6 +923,15 @@ async def example_runtime_agent_registration():
 # Main Entry Point
 # ============================================================================
 
+# Examples offered by main(), in menu order
+_EXAMPLES = (
+    ("Default Agents (pre-configured)", example_with_default_agents),
+    ("Custom Agents (register dynamically)", example_with_custom_agents),
+    ("Load from Config File", example_load_from_config),
+    ("Runtime Registration", example_runtime_agent_registration),
+)
+
+
 async def main():
     """
     Demonstrate flexible agent orchestration
@@ -553,21 +944,16 @@ async def main():
     ╚══════════════════════════════════════════════════════════════════╝
     """)
     
-    examples = {
-        "1": ("Default Agents (pre-configured)", example_with_default_agents),
-        "2": ("Custom Agents (register dynamically)", example_with_custom_agents),
-        "3": ("Load from Config File", example_load_from_config),
-        "4": ("Runtime Registration", example_runtime_agent_registration)
-    }
-    
     print("Available examples:")
-    for key, (name, _) in examples.items():
-        print(f"  {key}. {name}")
+    for i, (name, _) in enumerate(_EXAMPLES, 1):
+        print(f"  {i}. {name}")
     
     choice = input("\nSelect example (1-4): ").strip()
     
-    if choice in examples:
-        name, func = examples[choice]
+    index = int(choice) - 1 if choice.isdigit() else -1
+    
+    if 0 <= index < len(_EXAMPLES):
+        name, func = _EXAMPLES[index]
         print(f"\n\nRunning: {name}\n")
         result = await func()
         
@@ -581,7 +967,7 @@ async def main():
                 print(f"  • {file_info['name']} ({file_info['size']} bytes)")
     else:
         print("Invalid choice. Running example 1 by default.")
-        await examples["1"][1]()
+        await _EXAMPLES[0][1]()
 
 
 if __name__ == "__main__":
@@ -15,11 +15,20 @@ Architecture:
 - Hooks: Track all agent activities and tool calls
 """
 
+import argparse
 import asyncio
-import json
+import os
+import shutil
+import signal
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict, deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Set, Tuple
 from dataclasses import dataclass, field
 
 from claude_agent_sdk import (
@@ -29,26 +38,46 @@ from claude_agent_sdk import (
     TextBlock,
     ToolUseBlock,
     ToolResultBlock,
+    Hooks,
 )
 
+from fileutils import ensure_dir
 
-@dataclass
+
+# Tools whose successful calls create or modify a file
+_FILE_WRITE_TOOLS = frozenset({"Write", "Edit", "MultiEdit"})
+
+
+@dataclass(slots=True)
 class AgentActivity:
     """Track individual agent activities"""
     agent_name: str
     tool_name: str
-    timestamp: str
+    timestamp_ns: int  # time.time_ns() when the tool call started
     input_data: Dict[str, Any]
     output_data: Dict[str, Any] = field(default_factory=dict)
     parent_tool_id: str = None
+    tool_use_id: str | None = None
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO-formatted start time, computed on demand"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat()
 
 
 class ActivityTracker:
-    """Tracks all agent activities using SDK hooks"""
+    """
+    Tracks all agent activities using SDK hooks.
+    Only the most recent max_activities are kept, so long runs use bounded memory.
+    """
     
-    def __init__(self):
-        self.activities: List[AgentActivity] = []
+    def __init__(self, max_activities: int = 10_000):
+        self.max_activities = max_activities
+        self.activities: Deque[AgentActivity] = deque(maxlen=max_activities)
+        self._by_agent: Dict[str, Deque[AgentActivity]] = defaultdict(deque)
         self.subagent_map: Dict[str, str] = {}  # tool_use_id -> agent_name
+        self.written_files: Set[str] = set()  # paths created or modified via tools
+        self._in_flight: Dict[str, AgentActivity] = {}  # tool_use_id -> activity
         
     def pre_tool_use_hook(
         self, 
@@ -73,11 +102,25 @@ class ActivityTracker:
         activity = AgentActivity(
             agent_name=agent_name,
             tool_name=tool_name,
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             input_data=input_data,
-            parent_tool_id=parent_id
+            parent_tool_id=parent_id,
+            tool_use_id=tool_use_id
         )
+        if len(self.activities) == self.max_activities:
+            # The oldest activity is about to be evicted - drop it from the indexes
+            # too (a denied or aborted call never gets its post hook)
+            evicted = self.activities[0]
+            if evicted.tool_use_id:
+                self._in_flight.pop(evicted.tool_use_id, None)
+            agent_log = self._by_agent[evicted.agent_name]
+            agent_log.popleft()
+            if not agent_log:
+                del self._by_agent[evicted.agent_name]
         self.activities.append(activity)
+        self._by_agent[agent_name].append(activity)
+        if tool_use_id:
+            self._in_flight[tool_use_id] = activity
         
         return {}  # No modification to tool execution
     
@@ -89,9 +132,24 @@ class ActivityTracker:
         context: Any
     ) -> Dict[str, Any]:
         """Called after each tool execution"""
-        # Update the last activity with output
-        if self.activities:
-            self.activities[-1].output_data = output_data
+        # Update the matching activity with output. Concurrent stages interleave
+        # tool calls, so match on tool_use_id; the most recent activity is only
+        # a fallback when the SDK gives no id.
+        if tool_use_id:
+            activity = self._in_flight.pop(tool_use_id, None)
+        elif self.activities and not self.activities[-1].output_data:
+            activity = self.activities[-1]
+        else:
+            activity = None
+        if activity is not None:
+            activity.output_data = output_data
+        
+        # Record files written by agents so callers don't have to rescan the workspace
+        if input_data.get("tool_name") in _FILE_WRITE_TOOLS:
+            tool_input = input_data.get("tool_input", {})
+            file_path = tool_input.get("file_path") or tool_input.get("path")
+            if file_path:
+                self.written_files.add(file_path)
         
         return {}
     
@@ -101,41 +159,20 @@ class ActivityTracker:
         print("AGENT ACTIVITY SUMMARY")
         print("="*70)
         
-        # Group by agent
-        agent_groups = {}
-        for activity in self.activities:
-            if activity.agent_name not in agent_groups:
-                agent_groups[activity.agent_name] = []
-            agent_groups[activity.agent_name].append(activity)
-        
-        for agent_name, activities in agent_groups.items():
+        # Activities are already grouped by agent as they are recorded
+        for agent_name, activities in self._by_agent.items():
             print(f"\n[{agent_name}] - {len(activities)} tool calls")
             for activity in activities:
                 print(f"  → {activity.tool_name}")
-                if "query" in str(activity.input_data).lower():
-                    query = activity.input_data.get("tool_input", {}).get("query", "")
-                    if query:
-                        print(f"    Query: {query[:80]}...")
+                query_text = activity.input_data.get("tool_input", {}).get("query")
+                if query_text:
+                    print(f"    Query: {query_text[:80]}...")
         
         print("\n" + "="*70)
 
 
-class MultiAgentOrchestrator:
-    """
-    Orchestrates multiple specialized agents to complete complex tasks
-    """
-    
-    def __init__(self, workspace_dir: str = "./workspace"):
-        self.workspace = Path(workspace_dir)
-        self.workspace.mkdir(exist_ok=True)
-        self.tracker = ActivityTracker()
-        
-    def _create_lead_agent_prompt(self, task: str) -> str:
-        """
-        Create a comprehensive prompt for the lead agent that includes
-        task decomposition and coordination instructions
-        """
-        return f"""You are the LEAD AGENT coordinating a team of specialized subagents to complete complex tasks.
+# Lead agent instructions; filled in with the task and workspace per run
+_LEAD_PROMPT_TEMPLATE = """You are the LEAD AGENT coordinating a team of specialized subagents to complete complex tasks.
 
 YOUR CURRENT TASK:
 {task}
@@ -159,22 +196,16 @@ STEP-BY-STEP PROCESS:
    - Set run_in_background: true for parallel execution
 3. Collect outputs from each subagent
 4. Synthesize all findings into a comprehensive final result
-5. Save the final result to {self.workspace}/final_report.md
+5. Save the final result to {workspace}/final_report.md
 
 Begin by creating your execution plan."""
 
-    def _create_subagent_config(
-        self, 
-        subagent_type: str, 
-        prompt: str,
-        allowed_tools: List[str] = None
-    ) -> Dict[str, Any]:
-        """Configure a specialized subagent"""
-        
-        tool_configs = {
-            "research-specialist": {
-                "tools": ["Read", "Write", "WebSearch", "WebFetch"],
-                "system_prompt": """You are a specialized RESEARCH AGENT.
+
+# Tools and system prompts for the built-in subagent types
+_TOOL_CONFIGS: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    "research-specialist": {
+        "tools": ["Read", "Write", "WebSearch", "WebFetch"],
+        "system_prompt": """You are a specialized RESEARCH AGENT.
 Your job is to thoroughly research the given topic and create a detailed research note.
 
 YOUR PROCESS:
@@ -185,10 +216,10 @@ YOUR PROCESS:
 5. Save your findings to a file
 
 Be thorough and cite your sources."""
-            },
-            "data-analyst": {
-                "tools": ["Read", "Write", "Bash"],
-                "system_prompt": """You are a specialized DATA ANALYSIS AGENT.
+    },
+    "data-analyst": {
+        "tools": ["Read", "Write", "Bash"],
+        "system_prompt": """You are a specialized DATA ANALYSIS AGENT.
 Your job is to analyze data, create visualizations, and generate insights.
 
 YOUR PROCESS:
@@ -199,10 +230,10 @@ YOUR PROCESS:
 5. Save your analysis to files
 
 Focus on actionable insights."""
-            },
-            "technical-writer": {
-                "tools": ["Read", "Write"],
-                "system_prompt": """You are a specialized TECHNICAL WRITING AGENT.
+    },
+    "technical-writer": {
+        "tools": ["Read", "Write"],
+        "system_prompt": """You are a specialized TECHNICAL WRITING AGENT.
 Your job is to create clear, well-structured documentation.
 
 YOUR PROCESS:
@@ -213,13 +244,44 @@ YOUR PROCESS:
 5. Save your document to a file
 
 Write for clarity and accessibility."""
-            }
-        }
+    }
+})
+
+
+class MultiAgentOrchestrator:
+    """
+    Orchestrates multiple specialized agents to complete complex tasks
+    """
+    
+    def __init__(self, workspace_dir: str = "./workspace"):
+        self.workspace = Path(workspace_dir)
+        ensure_dir(self.workspace)
+        self.tracker = ActivityTracker()
+        # Hook callbacks never change, so one Hooks object serves every run
+        self._hooks = Hooks(
+            pre_tool_use=[self.tracker.pre_tool_use_hook],
+            post_tool_use=[self.tracker.post_tool_use_hook]
+        )
+        
+    def _create_lead_agent_prompt(self, task: str) -> str:
+        """
+        Create a comprehensive prompt for the lead agent that includes
+        task decomposition and coordination instructions
+        """
+        return _LEAD_PROMPT_TEMPLATE.format_map({"task": task, "workspace": self.workspace})
+
+    def _create_subagent_config(
+        self, 
+        subagent_type: str, 
+        prompt: str,
+        allowed_tools: List[str] = None
+    ) -> Dict[str, Any]:
+        """Configure a specialized subagent"""
         
-        config = tool_configs.get(subagent_type, {
+        config = _TOOL_CONFIGS.get(subagent_type) or {
             "tools": ["Read", "Write"],
             "system_prompt": f"You are a specialized {subagent_type} agent."
-        })
+        }
         
         return {
             "subagent_type": subagent_type,
@@ -228,12 +290,42 @@ Write for clarity and accessibility."""
             "system_prompt": config["system_prompt"]
         }
     
-    async def execute_task(self, task: str) -> Dict[str, Any]:
+    @staticmethod
+    async def _log_drain(queue: asyncio.Queue, interval: float = 0.01):
+        """
+        Print queued (tag, text) log events in batches until a None sentinel
+        is received. Long texts are truncated to 100 characters.
+        """
+        done = False
+        while not done:
+            events = [await queue.get()]
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            
+            lines = []
+            for event in events:
+                if event is None:
+                    done = True
+                    break
+                tag, text = event
+                if len(text) > 100:
+                    text = text[:100] + "..."
+                lines.append(f"[{tag}] {text}\n")
+            if lines:
+                sys.stdout.write("".join(lines))
+                sys.stdout.flush()
+            if not done:
+                await asyncio.sleep(interval)
+    
+    async def execute_task(self, task: str, *, plan_mode: bool = False) -> Dict[str, Any]:
         """
         Execute a complex task using multi-agent orchestration
         
         Args:
             task: High-level task description
+            plan_mode: Show the orchestration plan before executing. This is
+                meant for interactive review; scripted runs should leave it off,
+                since planning first roughly doubles the round-trips.
             
         Returns:
             Dict containing execution results and metadata
@@ -243,20 +335,13 @@ Write for clarity and accessibility."""
         print(f"{'='*70}")
         print(f"Task: {task}\n")
         
-        # Create hooks for activity tracking
-        from claude_agent_sdk import Hooks
-        hooks = Hooks(
-            pre_tool_use=[self.tracker.pre_tool_use_hook],
-            post_tool_use=[self.tracker.post_tool_use_hook]
-        )
-        
-        # Configure the lead agent with plan mode
-        # Use "plan" mode to see the orchestration plan before execution
+        # Configure the lead agent
+        # "plan" mode creates a plan first, then executes after approval
         options = ClaudeAgentOptions(
             cwd=str(self.workspace),
             allowed_tools=["Read", "Write", "Task", "Bash"],
-            permission_mode="plan",  # Creates plan first, then executes after approval
-            hooks=hooks,
+            permission_mode="plan" if plan_mode else "acceptEdits",
+            hooks=self._hooks,
             system_prompt="You are the lead orchestrator agent coordinating specialized subagents."
         )
         
@@ -272,19 +357,24 @@ Write for clarity and accessibility."""
         
         print("Lead agent is planning and executing...\n")
         
-        async for message in query(prompt=lead_prompt, options=options):
-            if isinstance(message, AssistantMessage):
-                for block in message.content:
-                    if isinstance(block, TextBlock):
-                        # Print agent reasoning
-                        if len(block.text) > 100:
-                            print(f"[LEAD] {block.text[:100]}...")
-                        else:
-                            print(f"[LEAD] {block.text}")
-                    
-                    elif isinstance(block, ToolUseBlock):
-                        # Log tool usage
-                        print(f"[TOOL] {block.name}")
+        # Terminal output is drained by a separate task so slow stdout
+        # doesn't hold up reading the message stream
+        log_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        log_task = asyncio.create_task(self._log_drain(log_queue))
+        try:
+            async for message in query(prompt=lead_prompt, options=options):
+                if isinstance(message, AssistantMessage):
+                    for block in message.content:
+                        if isinstance(block, TextBlock):
+                            # Print agent reasoning
+                            await log_queue.put(("LEAD", block.text))
+                        
+                        elif isinstance(block, ToolUseBlock):
+                            # Log tool usage
+                            await log_queue.put(("TOOL", block.name))
+        finally:
+            await log_queue.put(None)
+            await log_task
         
         # Check for final report
         final_report_path = self.workspace / "final_report.md"
@@ -294,10 +384,8 @@ Write for clarity and accessibility."""
         else:
             result["status"] = "completed_no_report"
         
-        # Collect all output files
-        for file_path in self.workspace.glob("**/*"):
-            if file_path.is_file():
-                result["outputs"].append(str(file_path))
+        # Output files, as recorded by the tool hooks
+        result["outputs"] = sorted(self.tracker.written_files)
         
         # Print activity summary
         self.tracker.print_summary()
@@ -347,12 +435,135 @@ class PipelineOrchestrator(MultiAgentOrchestrator):
     from one agent explicitly feed into the next
     """
     
+    def __init__(self, workspace_dir: str = "./workspace"):
+        super().__init__(workspace_dir)
+        self._options_cache: Dict[str, ClaudeAgentOptions] = {}  # agent_type -> options
+    
+    def _stage_options(self, agent_type: str, task: str) -> ClaudeAgentOptions:
+        """Get the (cached) options for a stage's agent type"""
+        options = self._options_cache.get(agent_type)
+        if options is None:
+            config = self._create_subagent_config(agent_type, task)
+            options = ClaudeAgentOptions(
+                cwd=str(self.workspace),
+                allowed_tools=config["allowed_tools"],
+                permission_mode="acceptEdits",
+                hooks=self._hooks,
+                system_prompt=config["system_prompt"]
+            )
+            self._options_cache[agent_type] = options
+        return options
+    
+    def _wrote_since(self, output_file: str, started: float) -> bool:
+        """True if output_file was written by a tool call or modified after started"""
+        target = (self.workspace / output_file).resolve()
+        written = {(self.workspace / path).resolve() for path in self.tracker.written_files}
+        if target in written:
+            return True
+        try:
+            return target.stat().st_mtime >= started
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _stage_name(index: int, stage: Dict[str, Any]) -> str:
+        return stage.get("name", f"Stage-{index+1}")
+    
+    def _stage_waves(self, stages: List[Dict[str, Any]]) -> List[List[Tuple[int, Dict[str, Any]]]]:
+        """
+        Group stages into dependency waves (Kahn's algorithm).
+        Dependencies on unknown stage names are ignored, as before.
+        """
+        names = [self._stage_name(i, stage) for i, stage in enumerate(stages)]
+        index_of = {name: i for i, name in enumerate(names)}
+        children: Dict[int, List[int]] = {i: [] for i in range(len(stages))}
+        indeg = [0] * len(stages)
+        for i, stage in enumerate(stages):
+            for dep in set(stage.get("dependencies", [])):
+                if dep in index_of:
+                    children[index_of[dep]].append(i)
+                    indeg[i] += 1
+        
+        waves = []
+        wave = [i for i in range(len(stages)) if indeg[i] == 0]
+        while wave:
+            waves.append([(i, stages[i]) for i in wave])
+            next_wave = []
+            for i in wave:
+                for child in children[i]:
+                    indeg[child] -= 1
+                    if indeg[child] == 0:
+                        next_wave.append(child)
+            wave = sorted(next_wave)
+        
+        if sum(len(w) for w in waves) != len(stages):
+            cyclic = [names[i] for i in range(len(stages)) if indeg[i] > 0]
+            raise ValueError(f"Cyclic dependency between pipeline stages: {cyclic}")
+        return waves
+    
+    async def _run_stage(
+        self,
+        index: int,
+        stage: Dict[str, Any],
+        stage_outputs: Dict[str, str],
+        stage_files: Dict[str, str]
+    ) -> Tuple[str, str]:
+        """
+        Run one pipeline stage and return (stage_name, joined text output).
+        If the stage declares an output_file and the agent wrote it during this
+        run, the path is recorded in stage_files for downstream stages.
+        """
+        stage_name = self._stage_name(index, stage)
+        agent_type = stage["agent_type"]
+        task = stage["task"]
+        dependencies = stage.get("dependencies", [])
+        
+        print(f"\n--- Stage {index+1}: {stage_name} ---")
+        print(f"Agent: {agent_type}")
+        
+        # Point to dependency output files, falling back to their text output
+        if dependencies:
+            parts = ["\n\nPREVIOUS STAGE OUTPUTS:\n"]
+            for dep in dependencies:
+                if dep in stage_files:
+                    parts.append(f"\n[{dep}]: see file {stage_files[dep]}\n")
+                elif dep in stage_outputs:
+                    parts.append(f"\n[{dep}]:\n{stage_outputs[dep]}\n")
+            task = task + "".join(parts)
+        
+        # Execute this stage
+        options = self._stage_options(agent_type, task)
+        
+        stage_output = []
+        started = time.time()
+        async for message in query(prompt=task, options=options):
+            if isinstance(message, AssistantMessage):
+                for block in message.content:
+                    if isinstance(block, TextBlock):
+                        stage_output.append(block.text)
+        
+        # Workspaces persist between runs, so only a file this stage wrote counts
+        output_file = stage.get("output_file")
+        if output_file and self._wrote_since(output_file, started):
+            stage_files[stage_name] = output_file
+        
+        print(f"✓ Stage {index+1} complete")
+        return stage_name, "\n".join(stage_output)
+    
     async def execute_pipeline(self, stages: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Execute a multi-stage pipeline where each stage can use outputs from previous stages
         
+        Independent stages run concurrently; a stage starts once the wave
+        containing all of its dependencies has finished.
+        
+        Stages may declare an output_file (relative to the workspace). Once
+        written, dependent stages are told to read that file instead of
+        receiving the full text output in their prompt.
+        
         Args:
-            stages: List of stage definitions with agent_type, task, and dependencies
+            stages: List of stage definitions with agent_type, task, dependencies
+                and an optional output_file
         """
         print(f"\n{'='*70}")
         print(f"STARTING PIPELINE ORCHESTRATION")
@@ -360,56 +571,31 @@ class PipelineOrchestrator(MultiAgentOrchestrator):
         print(f"Stages: {len(stages)}\n")
         
         stage_outputs = {}
+        stage_files: Dict[str, str] = {}  # stage_name -> declared output file
         
-        for i, stage in enumerate(stages):
-            stage_name = stage.get("name", f"Stage-{i+1}")
-            agent_type = stage["agent_type"]
-            task = stage["task"]
-            dependencies = stage.get("dependencies", [])
-            
-            print(f"\n--- Stage {i+1}: {stage_name} ---")
-            print(f"Agent: {agent_type}")
-            
-            # Inject dependency outputs into task prompt
-            if dependencies:
-                dep_context = "\n\nPREVIOUS STAGE OUTPUTS:\n"
-                for dep in dependencies:
-                    if dep in stage_outputs:
-                        dep_context += f"\n[{dep}]:\n{stage_outputs[dep]}\n"
-                task = task + dep_context
-            
-            # Execute this stage
-            from claude_agent_sdk import Hooks
-            hooks = Hooks(
-                pre_tool_use=[self.tracker.pre_tool_use_hook],
-                post_tool_use=[self.tracker.post_tool_use_hook]
-            )
-            
-            config = self._create_subagent_config(agent_type, task)
-            options = ClaudeAgentOptions(
-                cwd=str(self.workspace),
-                allowed_tools=config["allowed_tools"],
-                permission_mode="acceptEdits",
-                hooks=hooks,
-                system_prompt=config["system_prompt"]
-            )
-            
-            stage_output = []
-            async for message in query(prompt=task, options=options):
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            stage_output.append(block.text)
-            
-            # Store output for next stages
-            stage_outputs[stage_name] = "\n".join(stage_output)
-            print(f"✓ Stage {i+1} complete")
+        # Stages in the same wave don't depend on each other and run concurrently
+        for wave in self._stage_waves(stages):
+            tasks = [
+                asyncio.create_task(self._run_stage(i, stage, stage_outputs, stage_files))
+                for i, stage in wave
+            ]
+            try:
+                results = await asyncio.gather(*tasks)
+            finally:
+                # If one stage failed, stop its siblings writing to the workspace
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+            stage_outputs.update(results)
         
         self.tracker.print_summary()
         
         return {
             "status": "completed",
             "stage_outputs": stage_outputs,
+            "stage_files": stage_files,
             "workspace": str(self.workspace)
         }
 
@@ -426,7 +612,8 @@ async def example_pipeline():
             "agent_type": "research-specialist",
             "task": """Search for the top 5 AI companies by market cap in 2025.
             Create a file called companies.md with company names, market caps, and brief descriptions.""",
-            "dependencies": []
+            "dependencies": [],
+            "output_file": "companies.md"
         },
         {
             "name": "analysis",
@@ -434,7 +621,8 @@ async def example_pipeline():
             "task": """Read the companies.md file from the previous stage.
             Analyze the data and create a summary comparing these companies.
             Save your analysis to analysis.md""",
-            "dependencies": ["data-collection"]
+            "dependencies": ["data-collection"],
+            "output_file": "analysis.md"
         },
         {
             "name": "report-writing",
@@ -442,7 +630,8 @@ async def example_pipeline():
             "task": """Read both companies.md and analysis.md from previous stages.
             Create a comprehensive final report that combines all information.
             Save it as final_report.md with proper structure and formatting.""",
-            "dependencies": ["data-collection", "analysis"]
+            "dependencies": ["data-collection", "analysis"],
+            "output_file": "final_report.md"
         }
     ]
     
@@ -489,44 +678,279 @@ async def example_parallel_research():
 # MAIN ENTRY POINT
 # ============================================================================
 
-async def main():
+class RateLimiter:
+    """Spaces out acquisitions so at most `rps` start per second (rps <= 0: no limit)"""
+    
+    def __init__(self, rps: float):
+        self._interval = 1.0 / rps if rps > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def wait(self):
+        if not self._interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _env_number(name: str, parse: Callable[[str], Any], default: Any) -> Any:
+    """Parse a numeric environment variable, warning and using default if it is invalid"""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return parse(raw)
+    except ValueError:
+        print(f"Invalid {name}={raw!r}. Using the default of {default}.")
+        return default
+
+
+class Throttle:
     """
-    Run examples demonstrating different orchestration patterns
+    Concurrency and start-rate limits for example runs, so fan-out doesn't
+    trip API rate limits. Values <= 0 disable the corresponding limit.
     """
-    print("""
+    
+    def __init__(self, max_concurrency: int, rps: float):
+        self._sem = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self._rate = RateLimiter(rps)
+    
+    @classmethod
+    def from_env(cls) -> "Throttle":
+        """Read CLAUDE_MAX_CONCURRENCY (default 4) and CLAUDE_MAX_RPS (default 1)"""
+        return cls(
+            _env_number("CLAUDE_MAX_CONCURRENCY", int, 4),
+            _env_number("CLAUDE_MAX_RPS", float, 1.0)
+        )
+    
+    async def run(self, func):
+        """Run an example coroutine function under the limits"""
+        if self._sem is None:
+            await self._rate.wait()
+            return await func()
+        async with self._sem:
+            await self._rate.wait()
+            return await func()
+
+
+async def _lag_monitor(interval: float = 1.0, threshold: float = 0.05):
+    """Warn whenever the event loop wakes up noticeably later than scheduled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = loop.time() - start - interval
+        if lag > threshold:
+            print(f"[LAG] event loop blocked for {lag * 1000:.1f} ms")
+
+
+async def _warmup():
+    """Pre-load cold-start costs (CLI lookup, DNS) so the first query starts faster"""
+    loop = asyncio.get_running_loop()
+    
+    async def resolve_api():
+        try:
+            await loop.getaddrinfo("api.anthropic.com", 443, type=socket.SOCK_STREAM)
+        except OSError:
+            pass  # offline or no resolver; the CLI will report it properly
+    
+    # The SDK launches the `claude` CLI for every query; locating it up front
+    # primes the filesystem cache for that PATH lookup
+    await asyncio.gather(asyncio.to_thread(shutil.which, "claude"), resolve_api())
+
+
+# Menu choice -> (name, example coroutine function)
+EXAMPLES: Dict[str, Tuple[str, Callable[[], Awaitable[Any]]]] = {
+    "1": ("Simple Research Task", example_research_task),
+    "2": ("Multi-Stage Pipeline", example_pipeline),
+    "3": ("Parallel Execution", example_parallel_research)
+}
+
+_MENU = "Available examples:\n" + "".join(
+    f"  {key}. {name}\n" for key, (name, _) in EXAMPLES.items()
+)
+
+
+_SEP = "#" * 70
+
+_BANNER = """
     ╔══════════════════════════════════════════════════════════════════╗
     ║  Multi-Agent Orchestration with Claude Agent SDK                ║
     ║  Demonstration of Task Decomposition and Agent Coordination      ║
     ╚══════════════════════════════════════════════════════════════════╝
-    """)
+    """
+
+
+async def _read_line(prompt: str) -> str:
+    """
+    input() on a daemon thread, so the event loop keeps running meanwhile.
+    Unlike asyncio.to_thread(), a cancelled read doesn't keep the process alive
+    at shutdown waiting for the default executor's blocked thread.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
     
-    # Choose which example to run
-    examples = {
-        "1": ("Simple Research Task", example_research_task),
-        "2": ("Multi-Stage Pipeline", example_pipeline),
-        "3": ("Parallel Execution", example_parallel_research)
-    }
+    def resolve(result=None, error=None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
     
-    print("Available examples:")
-    for key, (name, _) in examples.items():
-        print(f"  {key}. {name}")
+    def reader():
+        try:
+            line = input(prompt)
+        except BaseException as e:  # EOFError, or stdin closed underneath us
+            args = (None, e)
+        else:
+            args = (line, None)
+        try:
+            loop.call_soon_threadsafe(resolve, *args)
+        except RuntimeError:
+            pass  # loop already closed - nobody is waiting any more
     
-    choice = input("\nSelect example (1-3) or 'all' to run all: ").strip()
+    threading.Thread(target=reader, name="stdin-reader", daemon=True).start()
+    return await future
+
+
+async def _choose_example() -> str:
+    """Pick the example: --example, then CLAUDE_EXAMPLE, then the menu"""
+    parser = argparse.ArgumentParser(description="Multi-agent orchestration examples")
+    parser.add_argument("--example", choices=[*EXAMPLES, "all"], default=None,
+                        help="Example to run without prompting")
+    args, _ = parser.parse_known_args()
+    choice = args.example or os.getenv("CLAUDE_EXAMPLE", "").strip()
+    
+    if not choice and not sys.stdin.isatty():
+        # Piped or CI run: nobody can answer the prompt
+        print("No interactive terminal. Running example 1 by default.")
+        choice = "1"
+    elif not choice:
+        sys.stdout.write(_MENU)
+        # Warm caches while the user reads the menu; there is no
+        # think-time to hide this behind on the non-interactive paths
+        warmup = asyncio.create_task(_warmup())
+        try:
+            choice = (await _read_line("\nSelect example (1-3) or 'all' to run all: ")).strip()
+        except EOFError:
+            choice = "1"
+        except asyncio.CancelledError:
+            warmup.cancel()
+            raise
+        
+        # Best effort only: never hold up or fail the example on warmup
+        try:
+            await asyncio.wait_for(warmup, timeout=1.0)
+        except Exception:
+            pass
     
+    return choice
+
+
+# Signal that cancelled main(), reported as the exit status (128 + signum)
+_shutdown_signal: int | None = None
+
+
+async def main():
+    """
+    Run examples demonstrating different orchestration patterns
+    """
+    print(_BANNER)
+    
+    # Turn Ctrl-C / SIGTERM into cancellation of this task - from the menu
+    # prompt onwards - so in-flight agent calls unwind through their own
+    # cleanup (POSIX only; on Windows the default KeyboardInterrupt handling
+    # is kept)
+    loop = asyncio.get_running_loop()
+    signals = (signal.SIGINT, signal.SIGTERM) if sys.platform != "win32" else ()
+    root = asyncio.current_task()
+    
+    def on_signal(signum: int):
+        global _shutdown_signal
+        _shutdown_signal = signum
+        root.cancel()
+    
+    for sig in signals:
+        loop.add_signal_handler(sig, on_signal, sig)
+    
+    monitor = None
+    profiler = None
+    try:
+        choice = await _choose_example()
+        
+        if os.getenv("ORCH_DEBUG") == "1":
+            # Makes asyncio report callbacks slower than loop.slow_callback_duration
+            loop.set_debug(True)
+        
+        if os.getenv("ORCH_PROFILE"):
+            try:
+                from pyinstrument import Profiler
+                # async_mode attributes time spent awaiting to the awaiting coroutine
+                profiler = Profiler(async_mode="enabled", interval=0.001)
+                profiler.start()
+            except ImportError:
+                print("ORCH_PROFILE is set but pyinstrument is not installed; profiling disabled.")
+        
+        monitor = asyncio.create_task(_lag_monitor())
+        await _dispatch(choice, Throttle.from_env())
+    except asyncio.CancelledError:
+        print("\nSignal received, shutting down...")
+        raise
+    finally:
+        if monitor is not None:
+            monitor.cancel()
+        for sig in signals:
+            loop.remove_signal_handler(sig)
+        if profiler is not None:
+            profiler.stop()
+            Path("profile.html").write_text(profiler.output_html(), encoding="utf-8")
+            print("Profile written to profile.html")
+
+
+async def _dispatch(choice: str, throttle: Throttle):
+    """Run the example(s) selected by choice"""
     if choice == "all":
-        for name, func in examples.values():
-            print(f"\n\n{'#'*70}")
-            print(f"# Running: {name}")
-            print(f"{'#'*70}\n")
-            await func()
-    elif choice in examples:
-        name, func = examples[choice]
-        await func()
+        # The examples use separate workspaces and are bound by API latency,
+        # so run them concurrently; their output will interleave
+        names = ", ".join(name for name, _ in EXAMPLES.values())
+        sys.stdout.write(f"\n\n{_SEP}\n# Running concurrently: {names}\n{_SEP}\n\n")
+        sys.stdout.flush()
+        results = await asyncio.gather(
+            *(throttle.run(func) for _, func in EXAMPLES.values()), return_exceptions=True
+        )
+        for (name, _), outcome in zip(EXAMPLES.values(), results):
+            if isinstance(outcome, BaseException):
+                print(f"✗ {name} failed: {outcome!r}")
+    elif choice in EXAMPLES:
+        name, func = EXAMPLES[choice]
+        await throttle.run(func)
     else:
         print("Invalid choice. Running example 1 by default.")
-        await example_research_task()
+        await throttle.run(example_research_task)
 
 
 if __name__ == "__main__":
+    # Use the libuv-based event loop when it is installed (not available on Windows)
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+    
     # Run the orchestrator
-    asyncio.run(main())
+    try:
+        if sys.version_info >= (3, 11):
+            with asyncio.Runner(loop_factory=loop_factory) as runner:
+                runner.run(main())
+        else:
+            if loop_factory is not None:
+                uvloop.install()
+            asyncio.run(main())
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        # KeyboardInterrupt only reaches here where no handler was installed (Windows)
+        sys.exit(128 + (_shutdown_signal or signal.SIGINT))
@@ -0,0 +1,62 @@
+"""
+JSON Serialization Helpers
+==========================
+
+Shared JSON encode/decode used by the orchestrators and examples.
+Picks the fastest backend available at import time: orjson, then ujson,
+then the stdlib json module, so the faster backends stay optional.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson wheel not available - try ujson next
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # fall back to stdlib json
+    ujson = None
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif ujson is not None:
+    BACKEND = "ujson"
+else:
+    BACKEND = "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, optionally indented by two spaces"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=default, option=option)
+    if ujson is not None:
+        # Match orjson output: raw UTF-8 and unescaped "/"
+        text = ujson.dumps(obj, indent=2 if indent else 0, default=default,
+                           ensure_ascii=False, escape_forward_slashes=False)
+        return text.encode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, default=default).encode("utf-8")
+
+
+def load_json(filepath: Union[str, Path]) -> Any:
+    """Read and parse a JSON file"""
+    return loads(Path(filepath).read_bytes())
+
+
+def dump_json(obj: Any, filepath: Union[str, Path]):
+    """Write obj to a file as indented JSON"""
+    Path(filepath).write_bytes(dumps(obj, indent=True))